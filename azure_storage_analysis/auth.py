@@ -1,4 +1,3 @@
-import fnmatch
 import sys
 import json
 import subprocess
@@ -7,6 +6,7 @@ from azure.identity import AzureCliCredential, DefaultAzureCredential, Interacti
 from azure.mgmt.storage import StorageManagementClient
 from azure.mgmt.subscription import SubscriptionClient
 from azure.mgmt.resource import ResourceManagementClient
+from .utils import compile_name_patterns, prompt_choice
 
 def get_all_subscriptions(credential):
     """Get all accessible subscriptions"""
@@ -74,21 +74,24 @@ def select_storage_accounts_to_process(storage_accounts, auto_mode=False, accoun
 	logger.info(f"Total available storage accounts: {total_accounts}")
 	if auto_mode or account_names or account_pattern:
 		if account_names:
+			# Storage account names are globally unique, so one entry per lowercase name suffices
+			by_name = {a.name.lower(): a for a in storage_accounts}
 			selected_accounts = []
+			missing_names = []
 			for account_name in account_names:
-				matching_accounts = [a for a in storage_accounts if a.name.lower() == account_name.lower()]
-				if matching_accounts:
-					selected_accounts.extend(matching_accounts)
+				account = by_name.get(account_name.lower())
+				if account is None:
+					missing_names.append(account_name)
 				else:
-					logger.warning(f"Storage account '{account_name}' not found in subscription")
+					selected_accounts.append(account)
+			if missing_names:
+				logger.warning(f"Storage accounts not found in subscription: {', '.join(missing_names)}")
 			if not selected_accounts:
 				logger.warning("No valid storage accounts found from specified names. Processing all accounts.")
 				selected_accounts = storage_accounts
 		elif account_pattern:
-			selected_accounts = []
-			for account in storage_accounts:
-				if fnmatch.fnmatch(account.name.lower(), account_pattern.lower()):
-					selected_accounts.append(account)
+			name_regex = compile_name_patterns(account_pattern)
+			selected_accounts = [a for a in storage_accounts if name_regex.match(a.name)]
 			if not selected_accounts:
 				logger.warning(f"No storage accounts matched pattern '{account_pattern}'. Processing all accounts.")
 				selected_accounts = storage_accounts
@@ -111,8 +114,47 @@ from azure.identity import AzureCliCredential, DefaultAzureCredential, Interacti
 from azure.mgmt.resource import ResourceManagementClient
 from azure.mgmt.subscription import SubscriptionClient
 
+try:
+	import orjson as _cli_json
+except ImportError:
+	_cli_json = json
+
 logger = logging.getLogger(__name__)
 
+# Result of `az account list`, fetched once per process and shared by every
+# caller that needs subscription or current-account information.
+_az_account_cache = {}
+
+# Credential that last completed a successful get_token in check_and_login_to_azure
+_authenticated_credential = None
+
+def _run_az(args):
+	"""Run an az CLI command and return its raw stdout bytes; raises RuntimeError on failure"""
+	# stdin is closed so the CLI can never block on a prompt inherited from our terminal
+	result = subprocess.run(['az', *args], stdin=subprocess.DEVNULL, capture_output=True)
+	if result.returncode != 0:
+		raise RuntimeError(result.stderr.decode(errors='replace'))
+	return result.stdout
+
+def get_az_account_list(refresh=False):
+	"""Return the parsed output of `az account list`, spawning the CLI at most once"""
+	if refresh or 'subs' not in _az_account_cache:
+		# Parse the raw bytes: orjson (or json) decodes UTF-8 itself, so no text-mode pass is needed
+		subs = _cli_json.loads(_run_az(['account', 'list', '--output', 'json',
+			'--query', '[].{id:id,name:name,state:state,isDefault:isDefault}']))
+		_az_account_cache['subs'] = subs
+		_az_account_cache['current_sub'] = next((s for s in subs if s.get('isDefault')), None)
+	return _az_account_cache['subs']
+
+def get_current_az_subscription_id():
+	"""Return the id of the subscription marked as default in the cached CLI account list"""
+	try:
+		get_az_account_list()
+	except Exception:
+		return None
+	current_sub = _az_account_cache.get('current_sub')
+	return current_sub.get('id') if current_sub else None
+
 def get_available_azure_subscriptions():
 	subscriptions = []
 	# Prefer SDK-based auth first
@@ -130,21 +172,18 @@ def get_available_azure_subscriptions():
 		logger.warning(f"SDK subscription listing failed: {e}")
 		# Fallback to az CLI if SDK fails
 		try:
-			result = subprocess.run(['az', 'account', 'list', '--output', 'json'], capture_output=True, text=True)
-			if result.returncode == 0:
-				subscription_data = json.loads(result.stdout)
-				for sub in subscription_data:
-					subscriptions.append({
-						'id': sub['id'],
-						'name': sub['name'],
-						'state': sub.get('state', 'Unknown'),
-						'is_default': sub.get('isDefault', False)
-					})
-			else:
-				logger.warning(f"Error running Azure CLI: {result.stderr}")
+			for sub in get_az_account_list():
+				subscriptions.append({
+					'id': sub['id'],
+					'name': sub['name'],
+					'state': sub.get('state', 'Unknown'),
+					'is_default': sub.get('isDefault', False)
+				})
+		except RuntimeError as e:
+			logger.warning(f"Error running Azure CLI: {e}")
 		except FileNotFoundError:
 			logger.warning("Azure CLI not found. Make sure it's installed and in your PATH.")
-		except json.JSONDecodeError:
+		except ValueError:
 			logger.warning("Error parsing Azure CLI output")
 	return subscriptions
 
@@ -153,15 +192,7 @@ def select_azure_subscription():
 	if not subscriptions:
 		logger.warning("No Azure subscriptions found. Please configure Azure CLI first.")
 		return None
-	try:
-		result = subprocess.run(['az', 'account', 'show', '--output', 'json'], capture_output=True, text=True)
-		if result.returncode == 0:
-			current_sub = json.loads(result.stdout)
-			current_sub_id = current_sub.get('id')
-		else:
-			current_sub_id = None
-	except Exception:
-		current_sub_id = None
+	current_sub_id = get_current_az_subscription_id()
 	print("\n" + "="*80)
 	print(" SELECT AZURE SUBSCRIPTION ".center(80, "="))
 	print("="*80)
@@ -172,42 +203,42 @@ def select_azure_subscription():
 	if current_sub_id:
 		print(f"\nC. Continue with current subscription")
 	print("X. Cancel and exit")
-	while True:
-		choice = input("\nEnter your choice (number, 'c', or 'x'): ").strip().lower()
-		if choice == 'x':
-			return None
-		elif choice == 'c' and current_sub_id:
-			return current_sub_id
-		else:
-			try:
-				idx = int(choice)
-				if 1 <= idx <= len(subscriptions):
-					return subscriptions[idx-1]['id']
-				else:
-					print(f"Please enter a number between 1 and {len(subscriptions)}")
-			except ValueError:
-				print("Please enter a valid choice")
+	choices = ['x'] + [str(i) for i in range(1, len(subscriptions) + 1)]
+	if current_sub_id:
+		choices.append('c')
+	choice = prompt_choice(
+		"\nEnter your choice (number, 'c', or 'x'): ", choices,
+		f"Please enter a number between 1 and {len(subscriptions)}, or a listed letter")
+	if choice == 'x':
+		return None
+	if choice == 'c':
+		return current_sub_id
+	return subscriptions[int(choice)-1]['id']
 
 def check_and_login_to_azure(auto_mode=False):
-	# Try SDK-based login first (browser or CLI)
+	global _authenticated_credential
+	if _authenticated_credential is not None:
+		return True
+	# Reuse an existing Azure CLI session first; this needs no browser round trip
 	try:
-		# Try browser-based login
-		credential = InteractiveBrowserCredential()
+		credential = AzureCliCredential()
 		token = credential.get_token("https://management.azure.com/.default")
 		if token:
-			logger.info("Successfully logged in via browser")
+			logger.info("Successfully logged in via Azure CLI")
+			_authenticated_credential = credential
 			return True
 	except Exception as e:
-		logger.warning(f"Browser-based login failed: {e}")
-	# Fallback to Azure CLI login
+		logger.warning(f"Azure CLI login failed: {e}")
+	# Fallback to browser-based login
 	try:
-		credential = AzureCliCredential()
+		credential = InteractiveBrowserCredential()
 		token = credential.get_token("https://management.azure.com/.default")
 		if token:
-			logger.info("Successfully logged in via Azure CLI")
+			logger.info("Successfully logged in via browser")
+			_authenticated_credential = credential
 			return True
 	except Exception as e:
-		logger.warning(f"Azure CLI login failed: {e}")
+		logger.warning(f"Browser-based login failed: {e}")
 	if auto_mode:
 		logger.error("Auto mode requires Azure authentication. Please login interactively or via Azure CLI.")
 		return False
@@ -220,7 +251,7 @@ def check_and_login_to_azure(auto_mode=False):
 	print("2. Use Azure CLI login")
 	print("X. Cancel and exit")
 	while True:
-		choice = input("\nEnter your choice (1, 2, or 'x'): ").strip().lower()
+		choice = prompt_choice("\nEnter your choice (1, 2, or 'x'): ", ('1', '2', 'x'), "Please enter 1, 2, or 'x'")
 		if choice == 'x':
 			return False
 		elif choice == '1':
@@ -230,6 +261,7 @@ def check_and_login_to_azure(auto_mode=False):
 				token = credential.get_token("https://management.azure.com/.default")
 				if token:
 					logger.info("Successfully logged in via browser")
+					_authenticated_credential = credential
 					return True
 			except Exception as e:
 				logger.error(f"Error during interactive login: {e}")
@@ -240,13 +272,12 @@ def check_and_login_to_azure(auto_mode=False):
 				token = credential.get_token("https://management.azure.com/.default")
 				if token:
 					logger.info("Successfully logged in via Azure CLI")
+					_authenticated_credential = credential
 					return True
 				else:
 					logger.error("Azure CLI login failed")
 			except Exception as e:
 				logger.error(f"Error during Azure CLI login: {e}")
-		else:
-			print("Please enter 1, 2, or 'x'")
 	return False
 
 def initialize_azure_clients(subscription_id=None, auto_mode=False):
@@ -257,8 +288,7 @@ def initialize_azure_clients(subscription_id=None, auto_mode=False):
 		if auto_mode:
 			try:
 				# Use SDK to get the first enabled subscription
-				credential = DefaultAzureCredential(exclude_interactive_browser_credential=False)
-				subscription_client = SubscriptionClient(credential)
+				subscription_client = SubscriptionClient(_authenticated_credential)
 				sub = next((s for s in subscription_client.subscriptions.list() if s.state.lower() == 'enabled'), None)
 				if sub:
 					subscription_id = sub.subscription_id
@@ -277,14 +307,9 @@ def initialize_azure_clients(subscription_id=None, auto_mode=False):
 	# No need to set active subscription in Azure CLI when using SDK
 	logger.info(f"Using subscription {subscription_id} for SDK clients.")
 	try:
-		try:
-			credential = AzureCliCredential()
-			subscription_client = SubscriptionClient(credential)
-			test_sub = next(subscription_client.subscriptions.list())
-			logger.info("Using AzureCliCredential")
-		except Exception:
-			credential = DefaultAzureCredential()
-			logger.info("Using DefaultAzureCredential")
+		# The credential was already proven by check_and_login_to_azure; no need to probe it again
+		credential = _authenticated_credential
+		logger.info(f"Using {type(credential).__name__}")
 		resource_client = ResourceManagementClient(credential, subscription_id)
 		storage_client = StorageManagementClient(credential, subscription_id)
 		return credential, subscription_id, resource_client, storage_client
@@ -301,14 +326,9 @@ def initialize_multi_subscription_analysis(subscription_ids=None, auto_mode=Fals
 		sys.exit(1)
 	
 	try:
-		try:
-			credential = AzureCliCredential()
-			subscription_client = SubscriptionClient(credential)
-			test_sub = next(subscription_client.subscriptions.list())
-			logger.info("Using AzureCliCredential for multi-subscription analysis")
-		except Exception:
-			credential = DefaultAzureCredential()
-			logger.info("Using DefaultAzureCredential for multi-subscription analysis")
+		# check_and_login_to_azure has already obtained a token with this credential
+		credential = _authenticated_credential
+		logger.info(f"Using {type(credential).__name__} for multi-subscription analysis")
 		
 		if subscription_ids is None:
 			# Get all accessible subscriptions
@@ -1,14 +1,34 @@
 import os
 import logging
+import threading
+from collections import defaultdict
 from datetime import datetime
-from azure.storage.blob import BlobServiceClient
-from azure.core.exceptions import ResourceNotFoundError
-from .cost_management import AzureCostAnalyzer
-from .reservations import AzureReservationAnalyzer
-from .savings_plans import AzureSavingsPlansAnalyzer
+
+# Blob/Share service clients keyed by (client class, account name). Each client owns an
+# HTTP pipeline, so reusing it keeps keep-alive connections warm across containers and shares.
+_service_clients = {}
+_service_clients_lock = threading.Lock()
+
+def _get_service_client(client_cls, account_name, conn_string):
+    key = (client_cls.__name__, account_name)
+    with _service_clients_lock:
+        client = _service_clients.get(key)
+        if client is None:
+            client = client_cls.from_connection_string(conn_string)
+            _service_clients[key] = client
+    return client
+
+# Connection strings keyed by (resource group, account name); only successful lookups are kept
+_connection_strings = {}
+_connection_strings_lock = threading.Lock()
 
 def get_storage_account_connection_string(storage_client, resource_group_name, account_name):
     # Use Azure SDK to get the storage account key and build the connection string
+    cache_key = (resource_group_name.lower(), account_name)
+    with _connection_strings_lock:
+        conn_str = _connection_strings.get(cache_key)
+    if conn_str:
+        return conn_str
     try:
         keys = storage_client.storage_accounts.list_keys(resource_group_name, account_name)
         if not keys or not keys.keys:
@@ -20,39 +40,66 @@ def get_storage_account_connection_string(storage_client, resource_group_name, a
             f"AccountKey={key};"
             f"EndpointSuffix=core.windows.net"
         )
+        with _connection_strings_lock:
+            _connection_strings[cache_key] = conn_str
         return conn_str
     except Exception as e:
         import logging
         logging.getLogger(__name__).error(f"Error getting connection string for {account_name}: {e}")
         return None
 
+def get_connection_strings_bulk(storage_client, accounts, max_workers=100):
+    # Fetch account keys in parallel; the pool size caps in-flight list_keys requests
+    import concurrent.futures
+    connection_strings = {}
+    if not accounts:
+        return connection_strings
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(accounts))) as executor:
+        futures = {
+            executor.submit(get_storage_account_connection_string, storage_client, account.id.split('/')[4], account.name): account.name
+            for account in accounts
+        }
+        for future in concurrent.futures.as_completed(futures):
+            connection_strings[futures[future]] = future.result()
+    return connection_strings
+
+def _analyze_container(args):
+    # Minimal implementation: count blobs in one container
+    blob_service_client, container_name, account_name, subscription_id = args
+    try:
+        container_client = blob_service_client.get_container_client(container_name)
+        # Only the count is needed: list names (no BlobProperties parsing) in maximum-size pages
+        blob_count = sum(1 for _ in container_client.list_blob_names(results_per_page=5000))
+        return {
+            'subscription_id': subscription_id,
+            'account_name': account_name,
+            'container_name': container_name,
+            'blob_count': blob_count
+        }
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error analyzing container {container_name} in {account_name}: {e}")
+        return {
+            'subscription_id': subscription_id,
+            'account_name': account_name,
+            'container_name': container_name,
+            'blob_count': 'ERROR'
+        }
+
 def process_containers_concurrently(containers_to_process, max_workers=10):
-    # Minimal implementation: list containers and count blobs for each
+    # Keep at most 2 * max_workers containers in flight, so pending futures don't pile up for
+    # large container counts. Results are collected in input order; the report needs all of them.
     import concurrent.futures
+    from collections import deque
+    window = 2 * max_workers
     results = []
-    def analyze_container(args):
-        blob_service_client, container_name, account_name, subscription_id = args
-        try:
-            container_client = blob_service_client.get_container_client(container_name)
-            blob_count = sum(1 for _ in container_client.list_blobs())
-            return {
-                'subscription_id': subscription_id,
-                'account_name': account_name,
-                'container_name': container_name,
-                'blob_count': blob_count
-            }
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).error(f"Error analyzing container {container_name} in {account_name}: {e}")
-            return {
-                'subscription_id': subscription_id,
-                'account_name': account_name,
-                'container_name': container_name,
-                'blob_count': 'ERROR'
-            }
+    pending = deque()
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for result in executor.map(analyze_container, containers_to_process):
-            results.append(result)
+        for args in containers_to_process:
+            pending.append(executor.submit(_analyze_container, args))
+            if len(pending) >= window:
+                results.append(pending.popleft().result())
+        while pending:
+            results.append(pending.popleft().result())
     return results
 
 def process_file_shares_concurrently(file_shares_to_process, max_workers=10):
@@ -74,7 +121,7 @@ def process_file_shares_concurrently(file_shares_to_process, max_workers=10):
                     'share_name': share_name,
                     'file_count': 'ERROR'
                 }
-            share_service_client = ShareServiceClient.from_connection_string(conn_string)
+            share_service_client = _get_service_client(ShareServiceClient, account_name, conn_string)
             share_client = share_service_client.get_share_client(share_name)
             # Count files in root directory (not recursive for now)
             file_count = sum(1 for _ in share_client.list_directories_and_files())
@@ -106,98 +153,28 @@ def _generate_enhanced_excel_report(container_results, file_share_results, cost_
     from openpyxl.chart import PieChart, Reference, BarChart, LineChart
     from datetime import datetime
     import os
-    wb = openpyxl.Workbook()
-
-    # Overview Sheet
-    ws_overview = wb.active
-    ws_overview.title = "Overview"
-    ws_overview.merge_cells('A1:M1')
-    ws_overview['A1'] = "Azure Storage Analysis Overview"
-    ws_overview['A1'].font = Font(size=16, bold=True, color="FFFFFF")
-    ws_overview['A1'].fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    ws_overview['A2'] = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-    ws_overview['A2'].font = Font(italic=True, color="666666")
-    ws_overview['A4'] = "Blob Storage Summary"
-    ws_overview['A4'].font = Font(size=14, bold=True, color="FFFFFF")
-    ws_overview['A4'].fill = PatternFill(start_color="ED7D31", end_color="ED7D31", fill_type="solid")
-    ws_overview['A5'] = "Metric"
-    ws_overview['B5'] = "Value"
-    ws_overview['A5'].font = ws_overview['B5'].font = Font(bold=True, color="FFFFFF")
-    ws_overview['A5'].fill = ws_overview['B5'].fill = PatternFill(start_color="305496", end_color="305496", fill_type="solid")
-    ws_overview['A6'] = "Total Containers"
-    ws_overview['A6'].font = Font(bold=True, color="305496")
-    ws_overview['B6'] = len(container_results)
-    ws_overview['A7'] = "Total Size"
-    ws_overview['B7'] = "0 B"  # Placeholder
-    ws_overview['A8'] = "Total Blobs"
-    ws_overview['B8'] = sum(r['blob_count'] for r in container_results if isinstance(r.get('blob_count'), int))
-    ws_overview['A9'] = "Average Blobs per Container"
-    ws_overview['B9'] = (ws_overview['B8'].value // ws_overview['B6'].value) if ws_overview['B6'].value else 0
-    # Table header
-    start_row = 11
-    headers = ["Storage Account", "Container", "Total Size", "Blobs 0KB-1MB", "Blobs 0KB-1MB Size", "Large Blobs (>1MB)", "Large Blobs Size", "Total Blobs", "30-90 Days Old", "30-90 Days %", "≥90 Days Old", "≥90 Days %"]
-    for col, h in enumerate(headers, 1):
-        cell = ws_overview.cell(row=start_row, column=col, value=h)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="305496", end_color="305496", fill_type="solid")
-    # Table data (minimal, just storage account and container)
-    for i, r in enumerate(container_results, start=start_row+1):
-        ws_overview.cell(row=i, column=1, value=r.get('account_name', ''))
-        ws_overview.cell(row=i, column=2, value=r.get('container_name', ''))
-        ws_overview.cell(row=i, column=8, value=r.get('blob_count', ''))
-    # Totals row
-    ws_overview.cell(row=i+1, column=1, value="TOTAL")
-    ws_overview.cell(row=i+1, column=8, value=ws_overview['B8'].value)
-    for col in range(1, len(headers)+1):
-        ws_overview.cell(row=i+1, column=col).font = Font(bold=True)
-        ws_overview.cell(row=i+1, column=col).fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-    # Autosize columns
-    for col in ws_overview.columns:
-        max_length = 0
-        col_letter = get_column_letter(col[0].column)
-        for cell in col:
-            try:
-                if cell.value and len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        ws_overview.column_dimensions[col_letter].width = max_length + 6  # Add extra padding
-    for row in ws_overview.iter_rows():
-        ws_overview.row_dimensions[row[0].row].height = 22
-
-    # Blob Storage Analysis Sheet (placeholder for detailed analysis)
-    ws_blob = wb.create_sheet(title="Blob Storage Analysis")
-    ws_blob.append(["Storage Account", "Container", "Total Size (HR)", "Blobs 0KB-1MB", "Blobs 0KB-1MB Size (HR)", "Large Blobs (>1MB)", "Large Blobs Size (HR)", "Total Blobs", "30-90 Days Old", "30-90 Days %", "≥90 Days Old", "≥90 Days %"])
-    for cell in ws_blob[1]:
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="305496", end_color="305496", fill_type="solid")
+    # Header and totals row styles
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="305496", end_color="305496", fill_type="solid")
+    total_font = Font(bold=True)
+    total_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+    # Aggregate once up front; the sheets below only format these values
+    total_blobs = 0
+    analyzed_containers = 0
     for r in container_results:
-        ws_blob.append([
-            r.get('account_name', ''),
-            r.get('container_name', ''),
-            "0 B", 0, "0 B", 0, "0 B", r.get('blob_count', ''), 0, 0, 0, 0
-        ])
-    # Totals row
-    ws_blob.append(["TOTAL", "", "0 B", 0, "0 B", 0, "0 B", ws_overview['B8'].value, 0, 0, 0, 0])
-    for cell in ws_blob[ws_blob.max_row]:
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-    for col in ws_blob.columns:
-        max_length = 0
-        col_letter = get_column_letter(col[0].column)
-        for cell in col:
-            try:
-                if cell.value and len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        ws_blob.column_dimensions[col_letter].width = max_length + 6
-    for row in ws_blob.iter_rows():
-        ws_blob.row_dimensions[row[0].row].height = 22
-
-    # File Shares Sheet
-    ws_file = wb.create_sheet(title="File Shares")
-    ws_file.append(["Storage Account", "File Share", "Tier", "Quota (GB)", "Total Size (HR)", "Usage %", "Total Files", "Total Directories", "Small Files (≤1MB)"])
+        count = r.get('blob_count')
+        if isinstance(count, int):
+            total_blobs += count
+            analyzed_containers += 1
+    total_files = 0
+    analyzed_shares = 0
+    for r in file_share_results:
+        count = r.get('file_count')
+        if isinstance(count, int):
+            total_files += count
+            analyzed_shares += 1
+    generated_at = datetime.now()
+    wb = openpyxl.Workbook()
 
     # Create all sheets first
     ws_overview = wb.active
@@ -212,48 +189,49 @@ def _generate_enhanced_excel_report(container_results, file_share_results, cost_
     ws_overview['A1'] = "Azure Storage Analysis Overview"
     ws_overview['A1'].font = Font(size=16, bold=True, color="FFFFFF")
     ws_overview['A1'].fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    ws_overview['A2'] = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    ws_overview['A2'] = f"Generated: {generated_at.strftime('%Y-%m-%d %H:%M:%S')}"
     ws_overview['A2'].font = Font(italic=True, color="666666")
     ws_overview['A4'] = "Blob Storage Summary"
     ws_overview['A4'].font = Font(size=14, bold=True, color="FFFFFF")
     ws_overview['A4'].fill = PatternFill(start_color="ED7D31", end_color="ED7D31", fill_type="solid")
     ws_overview['A5'] = "Metric"
     ws_overview['B5'] = "Value"
-    ws_overview['A5'].font = ws_overview['B5'].font = Font(bold=True, color="FFFFFF")
-    ws_overview['A5'].fill = ws_overview['B5'].fill = PatternFill(start_color="305496", end_color="305496", fill_type="solid")
+    ws_overview['A5'].font = ws_overview['B5'].font = header_font
+    ws_overview['A5'].fill = ws_overview['B5'].fill = header_fill
     ws_overview['A6'] = "Total Containers"
     ws_overview['A6'].font = Font(bold=True, color="305496")
     ws_overview['B6'] = len(container_results)
     ws_overview['A7'] = "Total Size"
     ws_overview['B7'] = "0 B"  # Placeholder
     ws_overview['A8'] = "Total Blobs"
-    ws_overview['B8'] = sum(r['blob_count'] for r in container_results if isinstance(r.get('blob_count'), int))
+    ws_overview['B8'] = total_blobs
     ws_overview['A9'] = "Average Blobs per Container"
-    ws_overview['B9'] = (ws_overview['B8'].value // ws_overview['B6'].value) if ws_overview['B6'].value else 0
+    ws_overview['B9'] = (total_blobs // len(container_results)) if container_results else 0
     # Table header
     start_row = 11
     headers = ["Storage Account", "Container", "Total Size", "Blobs 0KB-1MB", "Blobs 0KB-1MB Size", "Large Blobs (>1MB)", "Large Blobs Size", "Total Blobs", "30-90 Days Old", "30-90 Days %", "≥90 Days Old", "≥90 Days %"]
     for col, h in enumerate(headers, 1):
         cell = ws_overview.cell(row=start_row, column=col, value=h)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="305496", end_color="305496", fill_type="solid")
+        cell.font = header_font
+        cell.fill = header_fill
     # Table data (minimal, just storage account and container)
     for i, r in enumerate(container_results, start=start_row+1):
         ws_overview.cell(row=i, column=1, value=r.get('account_name', ''))
         ws_overview.cell(row=i, column=2, value=r.get('container_name', ''))
         ws_overview.cell(row=i, column=8, value=r.get('blob_count', ''))
     # Totals row
-    ws_overview.cell(row=i+1, column=1, value="TOTAL")
-    ws_overview.cell(row=i+1, column=8, value=ws_overview['B8'].value)
-    for col in range(1, len(headers)+1):
-        ws_overview.cell(row=i+1, column=col).font = Font(bold=True)
-        ws_overview.cell(row=i+1, column=col).fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+    total_row = start_row + len(container_results) + 1
+    ws_overview.cell(row=total_row, column=1, value="TOTAL")
+    ws_overview.cell(row=total_row, column=8, value=total_blobs)
+    for cell in next(ws_overview.iter_rows(min_row=total_row, max_row=total_row, max_col=len(headers))):
+        cell.font = total_font
+        cell.fill = total_fill
 
     # Blob Storage Analysis Sheet (placeholder for detailed analysis)
     ws_blob.append(["Storage Account", "Container", "Total Size (HR)", "Blobs 0KB-1MB", "Blobs 0KB-1MB Size (HR)", "Large Blobs (>1MB)", "Large Blobs Size (HR)", "Total Blobs", "30-90 Days Old", "30-90 Days %", "≥90 Days Old", "≥90 Days %"])
     for cell in ws_blob[1]:
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="305496", end_color="305496", fill_type="solid")
+        cell.font = header_font
+        cell.fill = header_fill
     for r in container_results:
         ws_blob.append([
             r.get('account_name', ''),
@@ -261,26 +239,26 @@ def _generate_enhanced_excel_report(container_results, file_share_results, cost_
             "0 B", 0, "0 B", 0, "0 B", r.get('blob_count', ''), 0, 0, 0, 0
         ])
     # Totals row
-    ws_blob.append(["TOTAL", "", "0 B", 0, "0 B", 0, "0 B", ws_overview['B8'].value, 0, 0, 0, 0])
+    ws_blob.append(["TOTAL", "", "0 B", 0, "0 B", 0, "0 B", total_blobs, 0, 0, 0, 0])
     for cell in ws_blob[ws_blob.max_row]:
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+        cell.font = total_font
+        cell.fill = total_fill
 
     # File Shares Sheet
     ws_file.append(["Storage Account", "File Share", "Tier", "Quota (GB)", "Total Size (HR)", "Usage %", "Total Files", "Total Directories", "Small Files (≤1MB)"])
     for cell in ws_file[1]:
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="305496", end_color="305496", fill_type="solid")
+        cell.font = header_font
+        cell.fill = header_fill
     for r in file_share_results:
         ws_file.append([
             r.get('account_name', ''),
             r.get('share_name', ''),
             "", "", "0 B", "", r.get('file_count', ''), "", 0
         ])
-    ws_file.append(["TOTAL", "", "", "", "0 B", "", sum(r['file_count'] for r in file_share_results if isinstance(r.get('file_count'), int)), "", 0])
+    ws_file.append(["TOTAL", "", "", "", "0 B", "", total_files, "", 0])
     for cell in ws_file[ws_file.max_row]:
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+        cell.font = total_font
+        cell.fill = total_fill
 
     # Cost Optimization Sheet
     ws_cost.merge_cells('A1:F1')
@@ -295,84 +273,56 @@ def _generate_enhanced_excel_report(container_results, file_share_results, cost_
     # Summary & Charts Sheet
     ws_summary.append(["Azure Storage Analysis Summary"])
     ws_summary.append([])
-    blob_count = sum(1 for r in container_results if isinstance(r.get('blob_count'), int))
-    file_count = sum(1 for r in file_share_results if isinstance(r.get('file_count'), int))
     ws_summary.append(["Storage Type", "Count"])
-    ws_summary.append(["Blob Containers", blob_count])
-    ws_summary.append(["File Shares", file_count])
+    ws_summary.append(["Blob Containers", analyzed_containers])
+    ws_summary.append(["File Shares", analyzed_shares])
     ws_summary.append([])
     ws_summary.append(["Recommendations:"])
     ws_summary.append(["- Review containers and shares with high object counts for cost optimization."])
     ws_summary.append(["- Consider lifecycle management for infrequently accessed data."])
     ws_summary.append(["- Enable soft delete and backup for critical data."])
     ws_summary.append([])
-    pie = PieChart()
-    labels = Reference(ws_summary, min_col=1, min_row=4, max_row=5)
-    data = Reference(ws_summary, min_col=2, min_row=4, max_row=5)
-    pie.add_data(data, titles_from_data=False)
-    pie.set_categories(labels)
-    pie.title = "Storage Type Distribution"
-    ws_summary.add_chart(pie, "D4")
-    bar = BarChart()
-    bar.add_data(data, titles_from_data=False)
-    bar.set_categories(labels)
-    bar.title = "Storage Type Distribution (Bar)"
-    ws_summary.add_chart(bar, "D20")
+    # A distribution chart of all-zero counts is empty, so only build the charts when something was analyzed
+    if analyzed_containers or analyzed_shares:
+        pie = PieChart()
+        labels = Reference(ws_summary, min_col=1, min_row=4, max_row=5)
+        data = Reference(ws_summary, min_col=2, min_row=4, max_row=5)
+        pie.add_data(data, titles_from_data=False)
+        pie.set_categories(labels)
+        pie.title = "Storage Type Distribution"
+        ws_summary.add_chart(pie, "D4")
+        bar = BarChart()
+        bar.add_data(data, titles_from_data=False)
+        bar.set_categories(labels)
+        bar.title = "Storage Type Distribution (Bar)"
+        ws_summary.add_chart(bar, "D20")
 
     # Now apply spacing to all sheets
     for ws in [ws_overview, ws_blob, ws_file, ws_cost, ws_summary]:
-        for col in ws.columns:
-            max_length = 0
-            col_letter = get_column_letter(col[0].column)
-            for cell in col:
-                try:
-                    if cell.value and len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            ws.column_dimensions[col_letter].width = max_length + 6
-        for row in ws.iter_rows():
-            ws.row_dimensions[row[0].row].height = 22
-    file_count = sum(1 for r in file_share_results if isinstance(r.get('file_count'), int))
-    ws_summary.append(["Storage Type", "Count"])
-    ws_summary.append(["Blob Containers", blob_count])
-    ws_summary.append(["File Shares", file_count])
-    ws_summary.append([])
-    ws_summary.append(["Recommendations:"])
-    ws_summary.append(["- Review containers and shares with high object counts for cost optimization."])
-    ws_summary.append(["- Consider lifecycle management for infrequently accessed data."])
-    ws_summary.append(["- Enable soft delete and backup for critical data."])
-    ws_summary.append([])
-    pie = PieChart()
-    labels = Reference(ws_summary, min_col=1, min_row=4, max_row=5)
-    data = Reference(ws_summary, min_col=2, min_row=4, max_row=5)
-    pie.add_data(data, titles_from_data=False)
-    pie.set_categories(labels)
-    pie.title = "Storage Type Distribution"
-    ws_summary.add_chart(pie, "D4")
-    bar = BarChart()
-    bar.add_data(data, titles_from_data=False)
-    bar.set_categories(labels)
-    bar.title = "Storage Type Distribution (Bar)"
-    ws_summary.add_chart(bar, "D20")
+        for col_idx, values in enumerate(ws.iter_cols(values_only=True), 1):
+            max_length = max((len(str(value)) for value in values if value), default=0)
+            ws.column_dimensions[get_column_letter(col_idx)].width = max_length + 6
+        for row_idx in range(1, ws.max_row + 1):
+            ws.row_dimensions[row_idx].height = 22
 
-    filename = f"azure_storage_analysis_enhanced_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    filename = f"azure_storage_analysis_enhanced_{generated_at.strftime('%Y%m%d_%H%M%S')}.xlsx"
     wb.save(filename)
     abs_path = os.path.abspath(filename)
     print(f"\nEnhanced Excel report written to: {abs_path}\n")
     import logging
     logging.getLogger(__name__).info(f"Enhanced Excel report written to {abs_path}")
-import fnmatch
-from azure.storage.blob import BlobServiceClient
+from .utils import compile_name_patterns
 
-def select_containers_to_process(storage_client, account, auto_mode=False, container_names=None, container_pattern=None, max_containers_per_account=None):
+def select_containers_to_process(storage_client, account, auto_mode=False, container_names=None, container_pattern=None, max_containers_per_account=None, conn_string=None):
+    from azure.storage.blob import BlobServiceClient
     try:
-        resource_group = account.id.split('/')[4]
-        conn_string = get_storage_account_connection_string(storage_client, resource_group, account.name)
+        if conn_string is None:
+            resource_group = account.id.split('/')[4]
+            conn_string = get_storage_account_connection_string(storage_client, resource_group, account.name)
         if not conn_string:
             logging.error(f"Could not get connection string for account {account.name}")
             return []
-        blob_service_client = BlobServiceClient.from_connection_string(conn_string)
+        blob_service_client = _get_service_client(BlobServiceClient, account.name, conn_string)
         containers = list(blob_service_client.list_containers())
         if not containers:
             logging.info(f"No containers found in account {account.name}")
@@ -381,19 +331,20 @@ def select_containers_to_process(storage_client, account, auto_mode=False, conta
         if auto_mode or container_names or container_pattern:
             selected_containers = []
             if container_names:
+                # Container names are unique within an account, so a lowercase-name dict finds each in one lookup
+                containers_by_name = {c.name.lower(): c for c in containers}
                 for container_name in container_names:
-                    matching_containers = [c for c in containers if c.name.lower() == container_name.lower()]
-                    if matching_containers:
-                        selected_containers.extend([(c.name, blob_service_client) for c in matching_containers])
+                    container = containers_by_name.get(container_name.lower())
+                    if container is not None:
+                        selected_containers.append((container.name, blob_service_client))
                     else:
                         logging.warning(f"Container '{container_name}' not found in account {account.name}")
                 if not selected_containers:
                     logging.warning(f"No valid containers found from specified names in account {account.name}. Processing all containers.")
                     selected_containers = [(container.name, blob_service_client) for container in containers]
             elif container_pattern:
-                for container in containers:
-                    if fnmatch.fnmatch(container.name.lower(), container_pattern.lower()):
-                        selected_containers.append((container.name, blob_service_client))
+                name_regex = compile_name_patterns(container_pattern)
+                selected_containers = [(c.name, blob_service_client) for c in containers if name_regex.match(c.name)]
                 if not selected_containers:
                     logging.warning(f"No containers matched pattern '{container_pattern}' in account {account.name}. Processing all containers.")
                     selected_containers = [(container.name, blob_service_client) for container in containers]
@@ -460,6 +411,10 @@ def get_azure_storage_analysis_enhanced(max_workers=10, export_detailed_blobs=Fa
             return False
         containers_to_process = []
         file_shares_to_process = []
+        connection_strings = {}
+        if analyze_containers:
+            logger.info(f"Retrieving connection strings for {len(selected_accounts)} storage accounts...")
+            connection_strings = get_connection_strings_bulk(storage_client, selected_accounts)
         for account in selected_accounts:
             logger.info(f"Processing storage account: {account.name}")
             if analyze_containers:
@@ -471,7 +426,8 @@ def get_azure_storage_analysis_enhanced(max_workers=10, export_detailed_blobs=Fa
                         auto_mode=auto_mode,
                         container_names=container_names,
                         container_pattern=container_pattern,
-                        max_containers_per_account=max_containers_per_account
+                        max_containers_per_account=max_containers_per_account,
+                        conn_string=connection_strings.get(account.name)
                     )
                     for container_name, blob_service_client in account_containers:
                         containers_to_process.append((
@@ -543,7 +499,10 @@ def get_azure_storage_analysis_enhanced(max_workers=10, export_detailed_blobs=Fa
             logger.info("No file shares found to analyze")
         logger.info("Performing cost management analysis...")
         
-        # Initialize cost analyzers
+        # Initialize cost analyzers (imported here: they pull in pandas and the cost management SDKs)
+        from .cost_management import AzureCostAnalyzer
+        from .reservations import AzureReservationAnalyzer
+        from .savings_plans import AzureSavingsPlansAnalyzer
         cost_analyzer = AzureCostAnalyzer(credential, [subscription_id])
         reservation_analyzer = AzureReservationAnalyzer(credential, [subscription_id])
         savings_plans_analyzer = AzureSavingsPlansAnalyzer(credential, [subscription_id])
@@ -673,7 +632,7 @@ def get_azure_storage_analysis_enhanced(max_workers=10, export_detailed_blobs=Fa
 
 import sys
 import argparse
-from azure_storage_analysis import auth, utils, reporting, recommendations
+from azure_storage_analysis import auth
 
 def select_subscriptions_interactive():
     """Interactive subscription selection"""
@@ -770,12 +729,9 @@ def get_multi_subscription_analysis(**kwargs):
             return False
         
         # Group storage accounts by subscription for reporting
-        subscription_groups = {}
+        subscription_groups = defaultdict(list)
         for account in all_storage_accounts:
-            sub_id = getattr(account, 'subscription_id', 'unknown')
-            if sub_id not in subscription_groups:
-                subscription_groups[sub_id] = []
-            subscription_groups[sub_id].append(account)
+            subscription_groups[getattr(account, 'subscription_id', 'unknown')].append(account)
         
         logger.info(f"Found storage accounts in {len(subscription_groups)} subscriptions:")
         for sub_id, accounts in subscription_groups.items():
@@ -8,6 +8,7 @@ from azure.mgmt.consumption import ConsumptionManagementClient
 from azure.mgmt.costmanagement import CostManagementClient
 from azure.core.exceptions import ResourceNotFoundError, HttpResponseError
 import json
+from collections import Counter, defaultdict
 
 class AzureCostAnalyzer:
     """Comprehensive Azure cost analysis including historical spending and recommendations"""
@@ -119,7 +120,7 @@ class AzureCostAnalyzer:
             
             # Parse results
             total_cost = 0
-            service_breakdown = {}
+            service_breakdown = defaultdict(lambda: {'total_cost': 0, 'resources': {}})
             
             if hasattr(result, 'rows') and result.rows:
                 for row in result.rows:
@@ -129,21 +130,16 @@ class AzureCostAnalyzer:
                     
                     total_cost += cost
                     
-                    if service_name not in service_breakdown:
-                        service_breakdown[service_name] = {
-                            'total_cost': 0,
-                            'resources': {}
-                        }
-                    
-                    service_breakdown[service_name]['total_cost'] += cost
-                    service_breakdown[service_name]['resources'][resource_type] = cost
+                    service = service_breakdown[service_name]
+                    service['total_cost'] += cost
+                    service['resources'][resource_type] = cost
             
             return {
                 'period': period_name,
                 'start_date': start_date,
                 'end_date': end_date,
                 'total_cost': total_cost,
-                'service_breakdown': service_breakdown,
+                'service_breakdown': dict(service_breakdown),
                 'cost_per_day': total_cost / (end_date - start_date).days if total_cost > 0 else 0
             }
             
@@ -300,15 +296,16 @@ class AzureCostAnalyzer:
                         meter_name = row[2] if len(row) > 2 else "Unknown"
                         cost = float(row[0]) if row[0] else 0
                         
-                        if resource_id not in vm_usage:
-                            vm_usage[resource_id] = {
+                        usage = vm_usage.get(resource_id)
+                        if usage is None:
+                            usage = vm_usage[resource_id] = {
                                 'total_cost': 0,
                                 'daily_costs': [],
                                 'meter_name': meter_name
                             }
                         
-                        vm_usage[resource_id]['total_cost'] += cost
-                        vm_usage[resource_id]['daily_costs'].append(cost)
+                        usage['total_cost'] += cost
+                        usage['daily_costs'].append(cost)
                 
                 # Generate RI recommendations
                 for resource_id, usage_data in vm_usage.items():
@@ -404,7 +401,7 @@ class AzureCostAnalyzer:
                 result = cost_client.query.usage(scope=scope, parameters=query_body)
                 
                 total_compute_spend = 0
-                service_spend = {}
+                service_spend = Counter()
                 
                 if hasattr(result, 'rows') and result.rows:
                     for row in result.rows:
@@ -412,7 +409,7 @@ class AzureCostAnalyzer:
                         service = row[1] if len(row) > 1 else "Unknown"
                         
                         total_compute_spend += cost
-                        service_spend[service] = service_spend.get(service, 0) + cost
+                        service_spend[service] += cost
                 
                 # Calculate savings plan recommendations
                 monthly_avg = total_compute_spend / 3  # 3 months average
@@ -420,7 +417,7 @@ class AzureCostAnalyzer:
                 if monthly_avg > 500:  # Minimum threshold for savings plans
                     # Compute Savings Plan (covers VMs, Container Instances, Functions)
                     compute_eligible_spend = sum(
-                        service_spend.get(service, 0) 
+                        service_spend[service]
                         for service in ["Virtual Machines", "Container Instances", "Functions"]
                     ) / 3
                     
@@ -7,9 +7,34 @@ from openpyxl.chart import PieChart, Reference, BarChart, LineChart
 from datetime import datetime
 import os
 import logging
+from .utils import PRIORITY_RANK
 
 logger = logging.getLogger(__name__)
 
+# Table header styles
+WHITE_BOLD_FONT = Font(bold=True, color="FFFFFF")
+BOLD_FONT = Font(bold=True)
+# Row highlight and trend colors
+PRIORITY_FILLS = {
+    'High': PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid"),
+    'Medium': PatternFill(start_color="FFF8DC", end_color="FFF8DC", fill_type="solid"),
+}
+HIGH_SAVINGS_FILL = PRIORITY_FILLS['High']
+INCREASE_FONT = Font(color="E74C3C")  # Red
+DECREASE_FONT = Font(color="27AE60")  # Green
+
+def _solid_fill(color):
+    """Create a solid PatternFill of the given RGB color"""
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+def _write_header_row(ws, row, headers, font, fill=None):
+    """Write a table header row, applying the same font and fill to each cell"""
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=row, column=col, value=header)
+        cell.font = font
+        if fill is not None:
+            cell.fill = fill
+
 def create_enhanced_excel_report_with_cost_analysis(container_results, file_share_results, 
                                                    cost_analysis=None, reservations_analysis=None, 
                                                    savings_plans_analysis=None):
@@ -251,16 +276,16 @@ def _create_monthly_spending_sheet(ws, cost_analysis):
     if total_spending:
         # Headers
         headers = ["Month", "Total Cost", "Change from Previous", "Change %", "Trend"]
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=current_row, column=col, value=header)
-            ws.cell(row=current_row, column=col).font = Font(bold=True, color="FFFFFF")
-            ws.cell(row=current_row, column=col).fill = PatternFill(start_color="34495E", end_color="34495E", fill_type="solid")
+        _write_header_row(ws, current_row, headers, WHITE_BOLD_FONT, _solid_fill("34495E"))
         
         current_row += 1
         
         # Data
         months = sorted(total_spending.keys())
-        mom_changes = {change['to_month']: change for change in cost_analysis.get('month_over_month_analysis', [])}
+        # Index month-over-month changes by target month (first entry wins, as the old scan did)
+        mom_changes = {}
+        for change in cost_analysis.get('month_over_month_analysis', []):
+            mom_changes.setdefault(change['to_month'], change)
         
         chart_data_start = current_row
         for month_key in months:
@@ -269,11 +294,7 @@ def _create_monthly_spending_sheet(ws, cost_analysis):
             cost = month_data.get('total_cost', 0)
             
             # Get change data
-            change_info = None
-            for change in cost_analysis.get('month_over_month_analysis', []):
-                if change['to_month'] == month_name:
-                    change_info = change
-                    break
+            change_info = mom_changes.get(month_name)
             
             if change_info:
                 change_amount = change_info.get('change_amount', 0)
@@ -294,11 +315,11 @@ def _create_monthly_spending_sheet(ws, cost_analysis):
             
             # Color code the change
             if change_amount > 0:
-                ws.cell(row=current_row, column=3).font = Font(color="E74C3C")  # Red
-                ws.cell(row=current_row, column=4).font = Font(color="E74C3C")
+                ws.cell(row=current_row, column=3).font = INCREASE_FONT
+                ws.cell(row=current_row, column=4).font = INCREASE_FONT
             elif change_amount < 0:
-                ws.cell(row=current_row, column=3).font = Font(color="27AE60")  # Green
-                ws.cell(row=current_row, column=4).font = Font(color="27AE60")
+                ws.cell(row=current_row, column=3).font = DECREASE_FONT
+                ws.cell(row=current_row, column=4).font = DECREASE_FONT
             
             current_row += 1
         
@@ -332,10 +353,7 @@ def _create_monthly_spending_sheet(ws, cost_analysis):
     if service_breakdown:
         # Headers for service breakdown
         headers = ["Service", "Total Cost", "Avg Monthly", "Trend", "Subscriptions"]
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=current_row, column=col, value=header)
-            ws.cell(row=current_row, column=col).font = Font(bold=True, color="FFFFFF")
-            ws.cell(row=current_row, column=col).fill = PatternFill(start_color="34495E", end_color="34495E", fill_type="solid")
+        _write_header_row(ws, current_row, headers, WHITE_BOLD_FONT, _solid_fill("34495E"))
         
         current_row += 1
         
@@ -394,10 +412,7 @@ def _create_storage_analysis_sheet(ws, container_results, file_share_results):
         
         # Headers
         headers = ["Subscription", "Storage Account", "Container", "Blob Count", "Status"]
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=current_row, column=col, value=header)
-            ws.cell(row=current_row, column=col).font = Font(bold=True, color="FFFFFF")
-            ws.cell(row=current_row, column=col).fill = PatternFill(start_color="2980B9", end_color="2980B9", fill_type="solid")
+        _write_header_row(ws, current_row, headers, WHITE_BOLD_FONT, _solid_fill("2980B9"))
         
         current_row += 1
         
@@ -425,10 +440,7 @@ def _create_storage_analysis_sheet(ws, container_results, file_share_results):
         
         # Headers
         headers = ["Subscription", "Storage Account", "File Share", "File Count", "Status"]
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=current_row, column=col, value=header)
-            ws.cell(row=current_row, column=col).font = Font(bold=True, color="FFFFFF")
-            ws.cell(row=current_row, column=col).fill = PatternFill(start_color="2980B9", end_color="2980B9", fill_type="solid")
+        _write_header_row(ws, current_row, headers, WHITE_BOLD_FONT, _solid_fill("2980B9"))
         
         current_row += 1
         
@@ -489,10 +501,7 @@ def _create_reservations_sheet(ws, reservations_analysis):
     
     # Headers
     headers = ["Priority", "Service", "Type", "Term", "Capacity", "Monthly Savings", "Annual Savings", "Upfront Cost", "Confidence"]
-    for col, header in enumerate(headers, 1):
-        ws.cell(row=current_row, column=col, value=header)
-        ws.cell(row=current_row, column=col).font = Font(bold=True, color="FFFFFF")
-        ws.cell(row=current_row, column=col).fill = PatternFill(start_color="6C3483", end_color="6C3483", fill_type="solid")
+    _write_header_row(ws, current_row, headers, WHITE_BOLD_FONT, _solid_fill("6C3483"))
     
     current_row += 1
     
@@ -503,7 +512,7 @@ def _create_reservations_sheet(ws, reservations_analysis):
     # Sort by priority and savings
     sorted_reservations = sorted(all_reservations, 
                                key=lambda x: (
-                                   {'High': 3, 'Medium': 2, 'Low': 1}.get(x.get('recommendation_priority', 'Low'), 1),
+                                   PRIORITY_RANK.get(x.get('recommendation_priority', 'Low'), 1),
                                    x.get('annual_savings', 0)
                                ), 
                                reverse=True)
@@ -529,13 +538,11 @@ def _create_reservations_sheet(ws, reservations_analysis):
         ws.cell(row=current_row, column=8, value=upfront)
         ws.cell(row=current_row, column=9, value=confidence)
         
-        # Color code by priority
-        if priority == 'High':
-            for col in range(1, 10):
-                ws.cell(row=current_row, column=col).fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")
-        elif priority == 'Medium':
-            for col in range(1, 10):
-                ws.cell(row=current_row, column=col).fill = PatternFill(start_color="FFF8DC", end_color="FFF8DC", fill_type="solid")
+        # Color code by priority across the row's cells in one slice
+        priority_fill = PRIORITY_FILLS.get(priority)
+        if priority_fill is not None:
+            for cell in next(ws.iter_rows(min_row=current_row, max_row=current_row, max_col=9)):
+                cell.fill = priority_fill
         
         current_row += 1
 
@@ -582,10 +589,7 @@ def _create_savings_plans_sheet(ws, savings_plans_analysis):
     
     # Headers
     headers = ["Priority", "Plan Type", "Term", "Monthly Commitment", "Annual Savings", "Savings %", "Flexibility", "Confidence", "Services Covered"]
-    for col, header in enumerate(headers, 1):
-        ws.cell(row=current_row, column=col, value=header)
-        ws.cell(row=current_row, column=col).font = Font(bold=True, color="FFFFFF")
-        ws.cell(row=current_row, column=col).fill = PatternFill(start_color="D68910", end_color="D68910", fill_type="solid")
+    _write_header_row(ws, current_row, headers, WHITE_BOLD_FONT, _solid_fill("D68910"))
     
     current_row += 1
     
@@ -596,7 +600,7 @@ def _create_savings_plans_sheet(ws, savings_plans_analysis):
     # Sort by priority and savings
     sorted_plans = sorted(all_plans, 
                          key=lambda x: (
-                             {'High': 3, 'Medium': 2, 'Low': 1}.get(x.get('recommendation_priority', 'Low'), 1),
+                             PRIORITY_RANK.get(x.get('recommendation_priority', 'Low'), 1),
                              x.get('estimated_annual_savings', 0)
                          ), 
                          reverse=True)
@@ -622,13 +626,11 @@ def _create_savings_plans_sheet(ws, savings_plans_analysis):
         ws.cell(row=current_row, column=8, value=confidence)
         ws.cell(row=current_row, column=9, value=services)
         
-        # Color code by priority
-        if priority == 'High':
-            for col in range(1, 10):
-                ws.cell(row=current_row, column=col).fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")
-        elif priority == 'Medium':
-            for col in range(1, 10):
-                ws.cell(row=current_row, column=col).fill = PatternFill(start_color="FFF8DC", end_color="FFF8DC", fill_type="solid")
+        # Color code by priority across the row's cells in one slice
+        priority_fill = PRIORITY_FILLS.get(priority)
+        if priority_fill is not None:
+            for cell in next(ws.iter_rows(min_row=current_row, max_row=current_row, max_col=9)):
+                cell.fill = priority_fill
         
         current_row += 1
 
@@ -690,10 +692,7 @@ def _create_cost_optimization_sheet(ws, cost_analysis, reservations_analysis, sa
     # Display high priority actions
     if high_priority_actions:
         headers = ["Action", "Annual Savings", "Investment Required"]
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=current_row, column=col, value=header)
-            ws.cell(row=current_row, column=col).font = Font(bold=True, color="FFFFFF")
-            ws.cell(row=current_row, column=col).fill = PatternFill(start_color="E74C3C", end_color="E74C3C", fill_type="solid")
+        _write_header_row(ws, current_row, headers, WHITE_BOLD_FONT, _solid_fill("E74C3C"))
         
         current_row += 1
         
@@ -704,8 +703,8 @@ def _create_cost_optimization_sheet(ws, cost_analysis, reservations_analysis, sa
             
             # Highlight high savings
             if "savings" in savings and float(savings.replace('$', '').replace(',', '').replace('/year', '')) > 5000:
-                for col in range(1, 4):
-                    ws.cell(row=current_row, column=col).fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")
+                for cell in next(ws.iter_rows(min_row=current_row, max_row=current_row, max_col=3)):
+                    cell.fill = HIGH_SAVINGS_FILL
             
             current_row += 1
         
@@ -725,10 +724,7 @@ def _create_cost_optimization_sheet(ws, cost_analysis, reservations_analysis, sa
     ]
     
     headers = ["Timeframe", "Action", "Details"]
-    for col, header in enumerate(headers, 1):
-        ws.cell(row=current_row, column=col, value=header)
-        ws.cell(row=current_row, column=col).font = Font(bold=True, color="FFFFFF")
-        ws.cell(row=current_row, column=col).fill = PatternFill(start_color="3498DB", end_color="3498DB", fill_type="solid")
+    _write_header_row(ws, current_row, headers, WHITE_BOLD_FONT, _solid_fill("3498DB"))
     
     current_row += 1
     
@@ -758,9 +754,7 @@ def _create_detailed_data_sheet(ws, container_results, file_share_results):
         current_row += 2
         
         headers = ["Subscription ID", "Account Name", "Container Name", "Blob Count", "Analysis Status"]
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=current_row, column=col, value=header)
-            ws.cell(row=current_row, column=col).font = Font(bold=True)
+        _write_header_row(ws, current_row, headers, BOLD_FONT)
         
         current_row += 1
         
@@ -781,9 +775,7 @@ def _create_detailed_data_sheet(ws, container_results, file_share_results):
         current_row += 2
         
         headers = ["Subscription ID", "Account Name", "Share Name", "File Count", "Analysis Status"]
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=current_row, column=col, value=header)
-            ws.cell(row=current_row, column=col).font = Font(bold=True)
+        _write_header_row(ws, current_row, headers, BOLD_FONT)
         
         current_row += 1
         
@@ -798,21 +790,13 @@ def _create_detailed_data_sheet(ws, container_results, file_share_results):
 def _format_sheet(ws):
     """Apply consistent formatting to a worksheet"""
     
-    # Auto-size columns
-    for column in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column[0].column)
-        
-        for cell in column:
-            try:
-                if cell.value and len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
+    # Auto-size columns, reading cell values only (no per-cell attribute access)
+    for col_idx, values in enumerate(ws.iter_cols(values_only=True), 1):
+        max_length = max((len(str(value)) for value in values if value), default=0)
         
         adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-        ws.column_dimensions[column_letter].width = adjusted_width
+        ws.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
     
     # Set row height
-    for row in ws.iter_rows():
-        ws.row_dimensions[row[0].row].height = 20
\ No newline at end of file
+    for row_idx in range(1, ws.max_row + 1):
+        ws.row_dimensions[row_idx].height = 20
\ No newline at end of file
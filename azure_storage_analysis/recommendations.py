@@ -2,7 +2,7 @@
 
 import logging
 from datetime import datetime, timedelta
-from .utils import format_bytes, safe_divide
+from .utils import GB, format_bytes, safe_divide
 
 def generate_cost_recommendations(storage_data):
     """Generate cost optimization recommendations based on storage analysis"""
@@ -152,5 +152,5 @@ def generate_summary_statistics(storage_data):
         'total_containers': total_containers,
         'total_blobs': total_blobs,
         'total_size_gb': total_size_gb,
-        'total_size_formatted': format_bytes(total_size_gb * 1024**3)
+        'total_size_formatted': format_bytes(total_size_gb * GB)
     }
@@ -8,6 +8,14 @@ from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
 import csv
 
+# openpyxl style objects are immutable, so these module-level instances are shared across cells
+HEADER_FONT = Font(bold=True)
+HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+RECOMMENDATION_PRIORITY_FILLS = {
+    'High': PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid"),
+    'Medium': PatternFill(start_color="FFF2E6", end_color="FFF2E6", fill_type="solid"),
+}
+
 def create_enhanced_excel_report(storage_data, recommendations, output_file):
     """Create enhanced Excel report with multiple sheets"""
     logger = logging.getLogger(__name__)
@@ -84,17 +92,7 @@ def _create_summary_sheet(workbook, storage_data, recommendations):
                 cell.fill = header_fill
     
     # Auto-adjust column widths
-    for column in sheet.columns:
-        max_length = 0
-        column = [cell for cell in column]
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = (max_length + 2) * 1.2
-        sheet.column_dimensions[get_column_letter(column[0].column)].width = adjusted_width
+    _auto_adjust_column_widths(sheet)
 
 def _create_blob_analysis_sheet(workbook, storage_data):
     """Create detailed blob storage analysis sheet"""
@@ -110,11 +108,10 @@ def _create_blob_analysis_sheet(workbook, storage_data):
     # Write headers
     for col, header in enumerate(headers, start=1):
         cell = sheet.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
     
-    # Write data
-    row_num = 2
+    # Write data; rows land directly after the header, so append avoids per-cell coordinate lookups
     for account in storage_data:
         account_name = account.get('account_name', 'Unknown')
         containers = account.get('containers', [])
@@ -130,28 +127,19 @@ def _create_blob_analysis_sheet(workbook, storage_data):
                 container.get('large_blobs_size_hr', '0 B'),
                 container.get('blob_count', 0),
                 container.get('blobs_30_90_days', 0),
-                f"{container.get('blobs_30_90_days_pct', 0):.1f}%",
+                container.get('blobs_30_90_days_pct', 0) / 100,
                 container.get('blobs_90_plus_days', 0),
-                f"{container.get('blobs_90_plus_days_pct', 0):.1f}%"
+                container.get('blobs_90_plus_days_pct', 0) / 100
             ]
-            
-            for col, value in enumerate(data_row, start=1):
-                sheet.cell(row=row_num, column=col, value=value)
-            
-            row_num += 1
+            sheet.append(data_row)
+    
+    # Percentages are stored as fractions so Excel's built-in percent format renders them
+    for pct_30_90_cell, _, pct_90_plus_cell in sheet.iter_rows(min_row=2, min_col=10, max_col=12):
+        pct_30_90_cell.number_format = '0.0%'
+        pct_90_plus_cell.number_format = '0.0%'
     
     # Auto-adjust column widths
-    for column in sheet.columns:
-        max_length = 0
-        column = [cell for cell in column]
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = (max_length + 2) * 1.2
-        sheet.column_dimensions[get_column_letter(column[0].column)].width = adjusted_width
+    _auto_adjust_column_widths(sheet)
 
 def _create_recommendations_sheet(workbook, recommendations):
     """Create cost optimization recommendations sheet"""
@@ -163,8 +151,8 @@ def _create_recommendations_sheet(workbook, recommendations):
     # Write headers
     for col, header in enumerate(headers, start=1):
         cell = sheet.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
     
     # Write recommendations
     for row, rec in enumerate(recommendations, start=2):
@@ -176,28 +164,16 @@ def _create_recommendations_sheet(workbook, recommendations):
             rec.get('potential_savings', 'TBD'),
             rec.get('action', '')
         ]
+        # Color-code by priority; the fill is resolved once per row, not per cell
+        priority_fill = RECOMMENDATION_PRIORITY_FILLS.get(rec.get('priority'))
         
         for col, value in enumerate(data_row, start=1):
             cell = sheet.cell(row=row, column=col, value=value)
-            
-            # Color-code by priority
-            if rec.get('priority') == 'High':
-                cell.fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-            elif rec.get('priority') == 'Medium':
-                cell.fill = PatternFill(start_color="FFF2E6", end_color="FFF2E6", fill_type="solid")
+            if priority_fill is not None:
+                cell.fill = priority_fill
     
-    # Auto-adjust column widths
-    for column in sheet.columns:
-        max_length = 0
-        column = [cell for cell in column]
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min((max_length + 2) * 1.2, 50)  # Cap at 50 for readability
-        sheet.column_dimensions[get_column_letter(column[0].column)].width = adjusted_width
+    # Auto-adjust column widths, capped at 50 for readability
+    _auto_adjust_column_widths(sheet, max_width=50)
 
 def _create_file_shares_sheet(workbook, file_shares_data):
     """Create Azure Files analysis sheet"""
@@ -209,11 +185,10 @@ def _create_file_shares_sheet(workbook, file_shares_data):
     # Write headers
     for col, header in enumerate(headers, start=1):
         cell = sheet.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
     
     # Write file shares data
-    row_num = 2
     for account in file_shares_data:
         account_name = account.get('account_name', 'Unknown')
         file_shares = account.get('file_shares', [])
@@ -226,11 +201,16 @@ def _create_file_shares_sheet(workbook, file_shares_data):
                 share.get('file_count', 0),
                 share.get('last_modified', 'Unknown')
             ]
-            
-            for col, value in enumerate(data_row, start=1):
-                sheet.cell(row=row_num, column=col, value=value)
-            
-            row_num += 1
+            sheet.append(data_row)
+
+def _auto_adjust_column_widths(sheet, max_width=None):
+    """Auto-adjust column widths based on content"""
+    for col_idx, values in enumerate(sheet.iter_cols(values_only=True), start=1):
+        max_length = max((len(str(value)) for value in values), default=0)
+        adjusted_width = (max_length + 2) * 1.2
+        if max_width is not None:
+            adjusted_width = min(adjusted_width, max_width)
+        sheet.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
 
 def add_watermark_to_sheet(sheet, watermark_text):
     """Add watermark to sheet"""
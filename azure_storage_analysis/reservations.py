@@ -1,12 +1,23 @@
 # Azure Reserved Instances Analysis and Recommendations
 
+import heapq
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import pandas as pd
+from .utils import PRIORITY_RANK
 
 logger = logging.getLogger(__name__)
 
+# Estimated $/TB/month pricing for reserved capacity sizing. These would typically come
+# from Azure Pricing APIs; upfront costs are the reserved monthly rate times the term length.
+BLOB_HOT_LRS_PAYG_PER_TB = 20
+BLOB_HOT_LRS_RESERVED_1YR_PER_TB = 16   # ~20% savings
+BLOB_HOT_LRS_RESERVED_3YR_PER_TB = 12   # ~40% savings
+FILES_PREMIUM_PAYG_PER_TB = 60
+FILES_PREMIUM_RESERVED_1YR_PER_TB = 48  # ~20% savings
+FILES_PREMIUM_RESERVED_3YR_PER_TB = 36  # ~40% savings
+
 class AzureReservationAnalyzer:
     """Analyze Azure usage patterns and provide Reserved Instance recommendations"""
     
@@ -159,15 +170,15 @@ class AzureReservationAnalyzer:
         reservation_tiers = []
         
         # Estimate current usage in TB based on cost (rough approximation)
-        estimated_tb = avg_monthly_cost / 20  # Approximate $20/TB/month for hot storage
+        estimated_tb = avg_monthly_cost / BLOB_HOT_LRS_PAYG_PER_TB
         
         # Standard LRS Hot Storage - 1 Year
         if estimated_tb >= 1:
             capacity_1yr = max(1, round(estimated_tb * 0.8))  # Conservative estimate
-            reserved_monthly_1yr = capacity_1yr * 16  # ~20% savings
+            reserved_monthly_1yr = capacity_1yr * BLOB_HOT_LRS_RESERVED_1YR_PER_TB
             monthly_savings_1yr = avg_monthly_cost - reserved_monthly_1yr
             annual_savings_1yr = monthly_savings_1yr * 12
-            upfront_1yr = capacity_1yr * 192  # Annual upfront cost
+            upfront_1yr = reserved_monthly_1yr * 12  # Annual upfront cost
             
             if monthly_savings_1yr > 0:
                 reservation_tiers.append({
@@ -188,10 +199,10 @@ class AzureReservationAnalyzer:
         # Standard LRS Hot Storage - 3 Years
         if estimated_tb >= 2:
             capacity_3yr = max(2, round(estimated_tb * 0.9))
-            reserved_monthly_3yr = capacity_3yr * 12  # ~40% savings
+            reserved_monthly_3yr = capacity_3yr * BLOB_HOT_LRS_RESERVED_3YR_PER_TB
             monthly_savings_3yr = avg_monthly_cost - reserved_monthly_3yr
             annual_savings_3yr = monthly_savings_3yr * 12
-            upfront_3yr = capacity_3yr * 432  # 3-year upfront cost
+            upfront_3yr = reserved_monthly_3yr * 36  # 3-year upfront cost
             
             if monthly_savings_3yr > 0:
                 reservation_tiers.append({
@@ -216,15 +227,15 @@ class AzureReservationAnalyzer:
         reservation_options = []
         
         # Estimate current usage based on cost
-        estimated_tb = avg_monthly_cost / 60  # Approximate $60/TB/month for premium files
+        estimated_tb = avg_monthly_cost / FILES_PREMIUM_PAYG_PER_TB
         
         # Premium Files - 1 Year
         if estimated_tb >= 0.5:
             capacity_1yr = max(1, round(estimated_tb))
-            reserved_monthly_1yr = capacity_1yr * 48  # ~20% savings
+            reserved_monthly_1yr = capacity_1yr * FILES_PREMIUM_RESERVED_1YR_PER_TB
             monthly_savings_1yr = avg_monthly_cost - reserved_monthly_1yr
             annual_savings_1yr = monthly_savings_1yr * 12
-            upfront_1yr = capacity_1yr * 576  # Annual upfront
+            upfront_1yr = reserved_monthly_1yr * 12  # Annual upfront
             
             if monthly_savings_1yr > 0:
                 reservation_options.append({
@@ -244,10 +255,10 @@ class AzureReservationAnalyzer:
         # Premium Files - 3 Years  
         if estimated_tb >= 1:
             capacity_3yr = max(1, round(estimated_tb))
-            reserved_monthly_3yr = capacity_3yr * 36  # ~40% savings
+            reserved_monthly_3yr = capacity_3yr * FILES_PREMIUM_RESERVED_3YR_PER_TB
             monthly_savings_3yr = avg_monthly_cost - reserved_monthly_3yr
             annual_savings_3yr = monthly_savings_3yr * 12
-            upfront_3yr = capacity_3yr * 1296  # 3-year upfront
+            upfront_3yr = reserved_monthly_3yr * 36  # 3-year upfront
             
             if monthly_savings_3yr > 0:
                 reservation_options.append({
@@ -311,12 +322,24 @@ class AzureReservationAnalyzer:
                 'average_savings_percentage': 0
             }
         
-        total_annual_savings = sum(rec.get('annual_savings', 0) for rec in all_recommendations)
-        total_upfront_cost = sum(rec.get('upfront_cost', 0) for rec in all_recommendations)
-        high_priority_count = sum(1 for rec in all_recommendations if rec.get('recommendation_priority') == 'High')
-        
-        savings_percentages = [rec.get('savings_percentage', 0) for rec in all_recommendations if rec.get('savings_percentage', 0) > 0]
-        avg_savings_pct = sum(savings_percentages) / len(savings_percentages) if savings_percentages else 0
+        # Single pass over the recommendations for all totals and counts
+        total_annual_savings = 0
+        total_upfront_cost = 0
+        priority_counts = {'High': 0, 'Medium': 0, 'Low': 0}
+        savings_pct_total = 0
+        savings_pct_count = 0
+        for rec in all_recommendations:
+            total_annual_savings += rec.get('annual_savings', 0)
+            total_upfront_cost += rec.get('upfront_cost', 0)
+            priority = rec.get('recommendation_priority')
+            if priority in priority_counts:
+                priority_counts[priority] += 1
+            savings_pct = rec.get('savings_percentage', 0)
+            if savings_pct > 0:
+                savings_pct_total += savings_pct
+                savings_pct_count += 1
+        
+        avg_savings_pct = savings_pct_total / savings_pct_count if savings_pct_count else 0
         
         return {
             'total_recommendations': len(all_recommendations),
@@ -324,9 +347,9 @@ class AzureReservationAnalyzer:
             'total_upfront_cost': round(total_upfront_cost, 2),
             'net_savings_year_1': round(total_annual_savings - total_upfront_cost, 2),
             'roi_percentage': round(((total_annual_savings - total_upfront_cost) / total_upfront_cost) * 100, 2) if total_upfront_cost > 0 else 0,
-            'high_priority_count': high_priority_count,
-            'medium_priority_count': sum(1 for rec in all_recommendations if rec.get('recommendation_priority') == 'Medium'),
-            'low_priority_count': sum(1 for rec in all_recommendations if rec.get('recommendation_priority') == 'Low'),
+            'high_priority_count': priority_counts['High'],
+            'medium_priority_count': priority_counts['Medium'],
+            'low_priority_count': priority_counts['Low'],
             'average_savings_percentage': round(avg_savings_pct, 2)
         }
 
@@ -337,15 +360,14 @@ class AzureReservationAnalyzer:
         all_recommendations = (recommendations.get('blob_storage_reservations', []) + 
                              recommendations.get('files_reservations', []))
         
-        # Sort by priority and savings
-        sorted_recs = sorted(all_recommendations, 
-                           key=lambda x: (
-                               {'High': 3, 'Medium': 2, 'Low': 1}.get(x.get('recommendation_priority', 'Low'), 1),
-                               x.get('annual_savings', 0)
-                           ), 
-                           reverse=True)
+        # Top 10 by priority and savings; nlargest keeps a 10-item heap instead of sorting everything
+        top_recs = heapq.nlargest(10, all_recommendations,
+                                  key=lambda x: (
+                                      PRIORITY_RANK.get(x.get('recommendation_priority', 'Low'), 1),
+                                      x.get('annual_savings', 0)
+                                  ))
         
-        for i, rec in enumerate(sorted_recs[:10], 1):  # Top 10 recommendations
+        for i, rec in enumerate(top_recs, 1):
             action = {
                 'priority_rank': i,
                 'action_type': 'Purchase Reservation',
@@ -1,9 +1,11 @@
 # Azure Savings Plans Analysis and Recommendations
 
+import heapq
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import pandas as pd
+from .utils import PRIORITY_RANK
 
 logger = logging.getLogger(__name__)
 
@@ -74,12 +76,8 @@ class AzureSavingsPlansAnalyzer:
             
             # Calculate monthly compute spending
             monthly_compute_costs = []
-            compute_services = ['Virtual Machines', 'Container Instances', 'Azure Functions', 'Dedicated Host']
             
             for month_data in sub_spending.values():
-                monthly_compute = 0
-                storage_costs = month_data.get('storage_costs', {})
-                
                 # Note: This is simplified - in reality you'd get actual compute costs
                 # For demonstration, we'll estimate compute costs
                 total_month_cost = month_data.get('total_cost', 0)
@@ -347,39 +345,50 @@ class AzureSavingsPlansAnalyzer:
                 'average_savings_percentage': 0
             }
         
-        total_annual_savings = sum(plan.get('estimated_annual_savings', 0) for plan in all_plans)
-        total_annual_commitment = sum(plan.get('annual_commitment', 0) for plan in all_plans)
-        high_priority_count = sum(1 for plan in all_plans if plan.get('recommendation_priority') == 'High')
-        
-        savings_percentages = [plan.get('savings_percentage', 0) for plan in all_plans]
-        avg_savings_pct = sum(savings_percentages) / len(savings_percentages) if savings_percentages else 0
+        # Single pass over the plans for all totals and counts
+        total_annual_savings = 0
+        total_annual_commitment = 0
+        savings_pct_total = 0
+        priority_counts = {'High': 0, 'Medium': 0, 'Low': 0}
+        plan_type_counts = {'Compute Savings Plan': 0, 'Azure Savings Plan': 0}
+        for plan in all_plans:
+            total_annual_savings += plan.get('estimated_annual_savings', 0)
+            total_annual_commitment += plan.get('annual_commitment', 0)
+            savings_pct_total += plan.get('savings_percentage', 0)
+            priority = plan.get('recommendation_priority')
+            if priority in priority_counts:
+                priority_counts[priority] += 1
+            plan_type = plan.get('plan_type')
+            if plan_type in plan_type_counts:
+                plan_type_counts[plan_type] += 1
+        
+        avg_savings_pct = savings_pct_total / len(all_plans)
         
         return {
             'total_plans': len(all_plans),
             'total_annual_savings': round(total_annual_savings, 2),
             'total_annual_commitment': round(total_annual_commitment, 2),
             'net_annual_benefit': round(total_annual_savings, 2),  # Savings plans don't have upfront costs
-            'high_priority_count': high_priority_count,
-            'medium_priority_count': sum(1 for plan in all_plans if plan.get('recommendation_priority') == 'Medium'),
-            'low_priority_count': sum(1 for plan in all_plans if plan.get('recommendation_priority') == 'Low'),
+            'high_priority_count': priority_counts['High'],
+            'medium_priority_count': priority_counts['Medium'],
+            'low_priority_count': priority_counts['Low'],
             'average_savings_percentage': round(avg_savings_pct, 2),
-            'compute_plans_count': sum(1 for plan in all_plans if plan.get('plan_type') == 'Compute Savings Plan'),
-            'azure_plans_count': sum(1 for plan in all_plans if plan.get('plan_type') == 'Azure Savings Plan')
+            'compute_plans_count': plan_type_counts['Compute Savings Plan'],
+            'azure_plans_count': plan_type_counts['Azure Savings Plan']
         }
     
     def _generate_savings_plans_action_plan(self, all_plans: List[Dict]) -> List[Dict]:
         """Generate prioritized action plan for implementing Savings Plans"""
         action_plan = []
         
-        # Sort by priority and savings
-        sorted_plans = sorted(all_plans,
-                            key=lambda x: (
-                                {'High': 3, 'Medium': 2, 'Low': 1}.get(x.get('recommendation_priority', 'Low'), 1),
-                                x.get('estimated_annual_savings', 0)
-                            ),
-                            reverse=True)
+        # Top 5 by priority and savings; nlargest keeps a 5-item heap instead of sorting everything
+        top_plans = heapq.nlargest(5, all_plans,
+                                   key=lambda x: (
+                                       PRIORITY_RANK.get(x.get('recommendation_priority', 'Low'), 1),
+                                       x.get('estimated_annual_savings', 0)
+                                   ))
         
-        for i, plan in enumerate(sorted_plans[:5], 1):  # Top 5 recommendations
+        for i, plan in enumerate(top_plans, 1):
             action = {
                 'priority_rank': i,
                 'action_type': 'Purchase Savings Plan',
@@ -8,6 +8,7 @@ from openpyxl.chart import PieChart, Reference, BarChart, LineChart
 from datetime import datetime
 import os
 import logging
+from .reporting import HEADER_FONT, HEADER_FILL
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,9 @@ def create_comprehensive_excel_report(container_results, file_share_results,
     """
     logger.info("Creating comprehensive Excel report with all analysis types...")
     
+    # One clock read for the whole report keeps the watermark and filename timestamps in step
+    generated_at = datetime.now()
+    
     wb = openpyxl.Workbook()
     wb.remove(wb.active)  # Remove default sheet
     
@@ -171,7 +175,7 @@ def create_comprehensive_excel_report(container_results, file_share_results,
             logger.warning(f"Failed to create Detailed Data sheet: {e}")
         
         # Add watermarks and auto-adjust column widths for all sheets
-        watermark_text = f"Azure FinOps Analysis Report - Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        watermark_text = f"Azure FinOps Analysis Report - Generated on {generated_at.strftime('%Y-%m-%d %H:%M:%S')}"
         for sheet_name, sheet in sheets.items():
             _add_watermark_to_sheet(sheet, watermark_text)
             try:
@@ -184,7 +188,7 @@ def create_comprehensive_excel_report(container_results, file_share_results,
         logger.info("Continuing with available data...")
     
     # Save the comprehensive report
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = generated_at.strftime("%Y%m%d_%H%M%S")
     filename = f"azure_finops_comprehensive_analysis_{timestamp}.xlsx"
     abs_path = os.path.abspath(filename)
     
@@ -246,9 +250,6 @@ def _create_original_summary_sheet(sheet, storage_data, recommendations):
             sheet[f'A{row}'] = f"{i}. {rec.get('title', 'Unknown')}"
             sheet[f'B{row}'] = rec.get('priority', 'Unknown')
             row += 1
-    
-    # Auto-adjust column widths
-    _auto_adjust_column_widths(sheet)
 
 
 def _create_original_blob_analysis_sheet(sheet, storage_data):
@@ -270,8 +271,8 @@ def _create_original_blob_analysis_sheet(sheet, storage_data):
     headers = ['Account Name', 'Location', 'SKU', 'Kind', 'Resource Group']
     for col, header in enumerate(headers, 1):
         cell = sheet.cell(row=3, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
     
     # Data rows
     row = 4
@@ -282,9 +283,6 @@ def _create_original_blob_analysis_sheet(sheet, storage_data):
         sheet.cell(row=row, column=4, value=account.get('kind', ''))
         sheet.cell(row=row, column=5, value=account.get('resource_group', ''))
         row += 1
-    
-    # Auto-adjust column widths
-    _auto_adjust_column_widths(sheet)
 
 
 def _create_container_results_analysis_sheet(sheet, container_results):
@@ -301,8 +299,8 @@ def _create_container_results_analysis_sheet(sheet, container_results):
     headers = ['Account Name', 'Container Name', 'Blob Count', 'Total Size (GB)', 'Last Modified', 'Access Tier']
     for col, header in enumerate(headers, 1):
         cell = sheet.cell(row=3, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
     
     # Data rows
     row = 4
@@ -314,9 +312,6 @@ def _create_container_results_analysis_sheet(sheet, container_results):
         sheet.cell(row=row, column=5, value=str(result.get('last_modified', '')))
         sheet.cell(row=row, column=6, value=result.get('access_tier', ''))
         row += 1
-    
-    # Auto-adjust column widths
-    _auto_adjust_column_widths(sheet)
 
 
 def _create_original_files_analysis_sheet(sheet, file_share_results):
@@ -330,8 +325,8 @@ def _create_original_files_analysis_sheet(sheet, file_share_results):
         headers = ['Account Name', 'Share Name', 'File Count', 'Total Size (GB)', 'Last Modified']
         for col, header in enumerate(headers, 1):
             cell = sheet.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+            cell.font = HEADER_FONT
+            cell.fill = HEADER_FILL
         
         row = 4
         for result in file_share_results:
@@ -341,9 +336,6 @@ def _create_original_files_analysis_sheet(sheet, file_share_results):
             sheet.cell(row=row, column=4, value=round(result.get('total_size_gb', 0), 3))
             sheet.cell(row=row, column=5, value=str(result.get('last_modified', '')))
             row += 1
-        
-        # Auto-adjust column widths
-        _auto_adjust_column_widths(sheet)
     else:
         # Try original format
         try:
@@ -378,8 +370,8 @@ def _create_original_recommendations_sheet(sheet, recommendations):
     headers = ['Priority', 'Type', 'Title', 'Description', 'Potential Savings']
     for col, header in enumerate(headers, 1):
         cell = sheet.cell(row=3, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
     
     # Data rows
     row = 4
@@ -394,20 +386,13 @@ def _create_original_recommendations_sheet(sheet, recommendations):
 
 def _auto_adjust_column_widths(sheet):
     """Auto-adjust column widths based on content"""
-    for column in sheet.columns:
-        max_length = 0
-        column_letter = get_column_letter(column[0].column)
-        
-        for cell in column:
-            if cell.value:
-                # Convert to string and get length
-                cell_length = len(str(cell.value))
-                if cell_length > max_length:
-                    max_length = cell_length
+    for col_idx, values in enumerate(sheet.iter_cols(values_only=True), 1):
+        # Convert to string and get length of the longest non-empty value
+        max_length = max((len(str(value)) for value in values if value), default=0)
         
         # Set column width with some padding (minimum 12, maximum 50)
         adjusted_width = min(max(max_length + 2, 12), 50)
-        sheet.column_dimensions[column_letter].width = adjusted_width
+        sheet.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
 
 
 def _add_watermark_to_sheet(sheet, watermark_text):
@@ -1,6 +1,7 @@
 # Utility functions for Azure Storage Analysis
 
 import logging
+import math
 import re
 from datetime import datetime, timedelta
 
@@ -16,18 +17,28 @@ def setup_logging():
     )
     return logging.getLogger(__name__)
 
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+GB = 1024 ** 3
+INV_GB = 1.0 / GB
+
+# Sort rank for recommendation priorities (higher sorts first with reverse=True)
+PRIORITY_RANK = {'High': 3, 'Medium': 2, 'Low': 1}
+
 def format_bytes(bytes_value):
     """Convert bytes to human readable format"""
     if bytes_value == 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB"]
+    # Each unit is 2**10 larger, so the bit length of the integer part picks it directly
     i = 0
-    while bytes_value >= 1024 and i < len(size_names) - 1:
-        bytes_value /= 1024.0
-        i += 1
+    if bytes_value >= 1024:
+        # inf has no bit length; like the old repeated division it lands on the largest unit
+        if math.isfinite(bytes_value):
+            i = min((int(bytes_value).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+        else:
+            i = len(SIZE_UNITS) - 1
     
-    return f"{bytes_value:.2f} {size_names[i]}"
+    return f"{bytes_value / (1 << (10 * i)):.2f} {SIZE_UNITS[i]}"
 
 def parse_size_string(size_str):
     """Parse size string like '1.5 GB' to bytes"""
@@ -47,7 +58,7 @@ def parse_size_string(size_str):
         'B': 1,
         'KB': 1024,
         'MB': 1024**2,
-        'GB': 1024**3,
+        'GB': GB,
         'TB': 1024**4
     }
     
@@ -63,6 +74,13 @@ def calculate_age_in_days(last_modified):
     
     return (datetime.now() - last_modified.replace(tzinfo=None)).days
 
+def compile_name_patterns(patterns):
+    """Compile one or more glob patterns into a single case-insensitive regex"""
+    import fnmatch
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    return re.compile('|'.join(f'(?:{fnmatch.translate(p)})' for p in patterns), re.IGNORECASE)
+
 def filter_by_pattern(items, pattern):
     """Filter items by glob pattern"""
     if not pattern:
@@ -71,6 +89,15 @@ def filter_by_pattern(items, pattern):
     import fnmatch
     return [item for item in items if fnmatch.fnmatch(item, pattern)]
 
+def prompt_choice(prompt, choices, error_message="Please enter a valid choice"):
+    """Prompt until the user enters one of the given choices; returns it lowercased"""
+    valid = {str(choice).lower() for choice in choices}
+    while True:
+        choice = input(prompt).strip().lower()
+        if choice in valid:
+            return choice
+        print(error_message)
+
 def safe_divide(numerator, denominator):
     """Safe division that returns 0 if denominator is 0"""
     return numerator / denominator if denominator != 0 else 0
@@ -15,29 +15,30 @@ def load_real_azure_data():
             latest_file = max(multi_files, key=os.path.getctime)
             print(f"📊 Loading multi-subscription data: {latest_file}")
             
-            with open(latest_file, 'r') as f:
+            with open(latest_file, 'r', encoding='utf-8') as f:
                 multi_data = json.load(f)
             
             # Convert multi-subscription format to single format for dashboard compatibility
-            if 'subscriptions' in multi_data:
+            subscriptions = multi_data.get('subscriptions')
+            if subscriptions is not None:
                 # Aggregate data from all subscriptions
                 all_accounts = []
                 total_cost = multi_data.get('total_cost', 0)
                 
-                for sub_id, sub_data in multi_data['subscriptions'].items():
+                for sub_id, sub_data in subscriptions.items():
                     for account in sub_data.get('storage_accounts', []):
                         account['subscription_id'] = sub_id  # Tag with subscription
                         all_accounts.append(account)
                 
                 # Return in format compatible with existing dashboard
                 return {
-                    'subscription_id': f"Multi-Sub ({len(multi_data['subscriptions'])} subscriptions)",
+                    'subscription_id': f"Multi-Sub ({len(subscriptions)} subscriptions)",
                     'storage_accounts': all_accounts,
                     'total_cost': total_cost,
                     'recommendations': multi_data.get('aggregated_recommendations', []),
                     'analysis_date': multi_data.get('analysis_date', ''),
                     'is_multi_subscription': True,
-                    'subscription_count': len(multi_data['subscriptions'])
+                    'subscription_count': len(subscriptions)
                 }
         
         # Fallback to single-subscription data
@@ -46,7 +47,7 @@ def load_real_azure_data():
             latest_file = max(single_files, key=os.path.getctime)
             print(f"📊 Loading single-subscription data: {latest_file}")
             
-            with open(latest_file, 'r') as f:
+            with open(latest_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
             # Add single-subscription flag
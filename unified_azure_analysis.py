@@ -8,8 +8,15 @@ Generates Excel CIR reports and prepares data for dashboard
 import os
 import json
 from datetime import datetime
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from azure_storage_analysis.auth import initialize_azure_clients, initialize_multi_subscription_analysis
-from azure_storage_analysis.core import get_storage_account_connection_string
+from azure_storage_analysis.core import get_connection_strings_bulk
+from azure_storage_analysis.utils import INV_GB, prompt_choice
 from azure_storage_analysis.cost_management import AzureCostAnalyzer
 from azure_storage_analysis.reservations import AzureReservationAnalyzer
 from azure_storage_analysis.savings_plans import AzureSavingsPlansAnalyzer
@@ -33,11 +40,7 @@ def run_unified_analysis():
     print("2. Multi-Subscription Analysis (enterprise view)")
     print("3. Auto-detect (recommended)")
     
-    while True:
-        choice = input("\nEnter your choice (1, 2, or 3): ").strip()
-        if choice in ['1', '2', '3']:
-            break
-        print("❌ Please enter 1, 2, or 3")
+    choice = prompt_choice("\nEnter your choice (1, 2, or 3): ", ('1', '2', '3'), "❌ Please enter 1, 2, or 3")
     
     # Initialize based on choice
     if choice == '1':
@@ -180,6 +183,7 @@ def analyze_subscription(credential, subscription_id, resource_client, storage_c
     try:
         # Get storage accounts
         accounts = list(storage_client.storage_accounts.list())
+        connection_strings = get_connection_strings_bulk(storage_client, accounts)
         
         for account in accounts:
             account_info = {
@@ -202,9 +206,7 @@ def analyze_subscription(credential, subscription_id, resource_client, storage_c
             
             # Analyze containers and file shares
             try:
-                conn_str = get_storage_account_connection_string(
-                    storage_client, account_info['resource_group'], account.name
-                )
+                conn_str = connection_strings.get(account.name)
                 
                 if conn_str:
                     # Analyze blob containers
@@ -259,13 +261,10 @@ def analyze_storage_account_details(conn_str, account_info):
                 blob_count = 0
                 total_size = 0
                 
-                # Sample first 10 blobs
-                for i, blob in enumerate(container_client.list_blobs()):
-                    if i >= 10:
-                        break
+                # Sample first 10 blobs; a 10-item page means only one small listing request is made
+                for blob in islice(container_client.list_blobs(results_per_page=10), 10):
                     blob_count += 1
-                    if hasattr(blob, 'size') and blob.size:
-                        total_size += blob.size
+                    total_size += getattr(blob, 'size', None) or 0
                 
                 containers.append({
                     'account_name': account_info['name'],
@@ -273,7 +272,7 @@ def analyze_storage_account_details(conn_str, account_info):
                     'container_name': container['name'],
                     'blob_count': blob_count,
                     'total_size_bytes': total_size,
-                    'total_size_gb': total_size / (1024*1024*1024) if total_size > 0 else 0,
+                    'total_size_gb': total_size * INV_GB if total_size > 0 else 0,
                     'last_modified': str(container.get('last_modified', '')),
                     'access_tier': 'Hot',
                     'sku': account_info['sku_name'],
@@ -289,23 +288,27 @@ def analyze_storage_account_details(conn_str, account_info):
         # Analyze file shares
         from azure.storage.fileshare import ShareServiceClient
         file_service_client = ShareServiceClient.from_connection_string(conn_str)
-        shares = list(file_service_client.list_shares())
+        # Stream the share listing into local rows; quota comes with each list page.
+        # Results are only extended once the listing completes, so a mid-listing failure adds no rows.
+        share_rows = []
+        for share in file_service_client.list_shares():
+            share_rows.append({
+                'account_name': account_info['name'],
+                'resource_group': account_info['resource_group'],
+                'share_name': share['name'],
+                'file_count': 0,
+                'total_size_gb': share.get('quota', 0),
+                'quota': share.get('quota', 0),
+                'last_modified': str(share.get('last_modified', '')),
+                'sku': account_info['sku_name'],
+                'location': account_info['location']
+            })
+        file_shares.extend(share_rows)
         
-        if shares:
-            print(f"      File Shares: {len(shares)}")
-            for share in shares:
-                file_shares.append({
-                    'account_name': account_info['name'],
-                    'resource_group': account_info['resource_group'],
-                    'share_name': share['name'],
-                    'file_count': 0,
-                    'total_size_gb': share.get('quota', 0),
-                    'quota': share.get('quota', 0),
-                    'last_modified': str(share.get('last_modified', '')),
-                    'sku': account_info['sku_name'],
-                    'location': account_info['location']
-                })
-                print(f"         📂 {share['name']}")
+        if share_rows:
+            print(f"      File Shares: {len(share_rows)}")
+            for share in share_rows:
+                print(f"         📂 {share['share_name']}")
         
     except Exception as e:
         print(f"      ⚠️  Error analyzing storage account: {str(e)[:50]}...")
@@ -399,8 +402,15 @@ def save_analysis_results(results, analysis_type):
         data_to_save = results
     
     try:
-        with open(filename, 'w') as f:
-            json.dump(data_to_save, f, indent=2, default=str)
+        if orjson is not None:
+            # Datetimes pass through to default=str and text is unescaped UTF-8, as in the json branch below.
+            # Only exponent spelling of very large/small floats differs (1e-7 vs 1e-07); values parse identically.
+            options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data_to_save, default=str, option=options))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(data_to_save, f, indent=2, default=str, ensure_ascii=False)
         print(f"💾 Analysis results saved to: {filename}")
         return filename
     except Exception as e: